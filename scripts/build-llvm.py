@@ -59,9 +59,10 @@ def build_native_tools(project_root: Path, build_dir: Path) -> Path:
     required_tools = ["llvm-tblgen", "llvm-min-tblgen", "clang-tblgen"]
     optional_tools = ["clang-tidy-confusable-chars-gen"]
 
-    for tool in required_tools:
-        print(f"Building native {tool}...")
-        subprocess.check_call(["cmake", "--build", str(native_dir), "--target", tool])
+    print(f"Building native tools: {', '.join(required_tools)}...")
+    subprocess.check_call(
+        ["cmake", "--build", str(native_dir), "--target", *required_tools]
+    )
 
     for tool in optional_tools:
         try:
@@ -329,9 +330,14 @@ def main():
     lib_dir = install_prefix / "lib"
     sizes = []
     if lib_dir.exists():
-        for p in lib_dir.rglob("*"):
-            if p.is_file():
-                sizes.append((p, p.stat().st_size))
+        stack = [str(lib_dir)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        sizes.append((Path(entry.path), entry.stat().st_size))
     sizes.sort(key=lambda x: x[1], reverse=True)
 
     total_size = sum(sz for _, sz in sizes)
@@ -48,6 +48,17 @@ CONDA_MARKERS = ("conda", ".pixi", "/envs/")
 # @rpath / @loader_path / absolute conda paths) is a violation.
 MACOS_SYSTEM_PREFIXES = ("/usr/lib/", "/System/Library/")
 
+# Mach-O: 32/64-bit little/big endian, or a fat/universal archive.
+MACHO_MAGICS = frozenset(
+    {
+        b"\xcf\xfa\xed\xfe",  # 64-bit LE
+        b"\xce\xfa\xed\xfe",  # 32-bit LE
+        b"\xfe\xed\xfa\xcf",  # 64-bit BE
+        b"\xfe\xed\xfa\xce",  # 32-bit BE
+        b"\xca\xfe\xba\xbe",  # fat/universal
+    }
+)
+
 
 def run_tool(args: list[str]) -> str:
     result = subprocess.run(args, capture_output=True, text=True)
@@ -73,18 +84,11 @@ def assert_parsed(count: int, tool: str, what: str) -> list[str]:
 
 
 def detect_format(binary: Path) -> str:
-    magic = binary.read_bytes()[:4]
+    with binary.open("rb") as f:
+        magic = f.read(4)
     if magic[:4] == b"\x7fELF":
         return "elf"
-    # Mach-O: 32/64-bit little/big endian, or a fat/universal archive.
-    macho = {
-        b"\xcf\xfa\xed\xfe",  # 64-bit LE
-        b"\xce\xfa\xed\xfe",  # 32-bit LE
-        b"\xfe\xed\xfa\xcf",  # 64-bit BE
-        b"\xfe\xed\xfa\xce",  # 32-bit BE
-        b"\xca\xfe\xba\xbe",  # fat/universal
-    }
-    if magic in macho:
+    if magic in MACHO_MAGICS:
         return "macho"
     raise RuntimeError(f"{binary}: unrecognized object file magic {magic!r}")
 
@@ -11,9 +11,11 @@ Actions:
 """
 
 import argparse
+import collections
 import concurrent.futures
 import fnmatch
 import json
+import os
 import shutil
 import subprocess
 import sys
@@ -22,7 +24,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-ARTIFACTS = [
+ARTIFACTS = (
     "aarch64-unknown-linux-gnu.releasedbg-lto.tar.xz",
     "aarch64-unknown-linux-gnu.releasedbg.tar.xz",
     "aarch64-pc-windows-msvc.releasedbg-lto.tar.xz",
@@ -37,10 +39,16 @@ ARTIFACTS = [
     "x86_64-apple-darwin.releasedbg.tar.xz",
     "x86_64-pc-windows-msvc.releasedbg-lto.tar.xz",
     "x86_64-pc-windows-msvc.releasedbg.tar.xz",
-]
+)
 
 ARCHIVE_MAGIC = b"!<arch>\n"
 
+MANIFEST_DIRS = {
+    "linux-gnu": "prune-manifest-ubuntu-24.04",
+    "apple-darwin": "prune-manifest-macos-15",
+    "windows-msvc": "prune-manifest-windows-2025",
+}
+
 
 def _is_shared_lib(path: Path) -> bool:
     return ".so" in path.suffixes or ".dylib" in path.suffixes
@@ -63,30 +71,26 @@ def _remove_binaries(build_dir: Path) -> None:
 
 
 def _run_build(build_dir: Path) -> bool:
-    try:
-        subprocess.run(
-            ["cmake", "--build", str(build_dir)],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+    # Only the tail is ever shown, so keep just that instead of buffering a
+    # full rebuild log in memory per probe.
+    proc = subprocess.Popen(
+        ["cmake", "--build", str(build_dir)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    tail = collections.deque(proc.stdout, maxlen=50)
+    if proc.wait() == 0:
         return True
-    except subprocess.CalledProcessError as exc:
-        combined = (exc.stdout or "") + (exc.stderr or "")
-        if combined:
-            print("Build output (last lines):")
-            for line in combined.splitlines()[-50:]:
-                print(line)
-        return False
+    if tail:
+        print("Build output (last lines):")
+        for line in tail:
+            print(line, end="")
+    return False
 
 
 def _manifest_for(artifact: str, manifests_dir: Path) -> Optional[Path]:
-    manifest_dirs = {
-        "linux-gnu": "prune-manifest-ubuntu-24.04",
-        "apple-darwin": "prune-manifest-macos-15",
-        "windows-msvc": "prune-manifest-windows-2025",
-    }
-    for platform, dirname in manifest_dirs.items():
+    for platform, dirname in MANIFEST_DIRS.items():
         if platform in artifact:
             return manifests_dir / dirname / "pruned-libs.json"
     return None
@@ -172,6 +176,7 @@ def _compress_tar_xz(
     output_path: Path,
     xz_level: str,
     label: str,
+    xz_threads: int = 0,
 ) -> int:
     print(f"[{label}] Compressing (xz {xz_level})...", flush=True)
     with output_path.open("wb") as out:
@@ -180,7 +185,7 @@ def _compress_tar_xz(
             stdout=subprocess.PIPE,
         )
         xz = subprocess.Popen(
-            ["xz", "-T0", xz_level, "-c"],
+            ["xz", f"-T{xz_threads}", xz_level, "-c"],
             stdin=tar.stdout,
             stdout=out,
         )
@@ -194,13 +199,38 @@ def _compress_tar_xz(
     return output_path.stat().st_size
 
 
+def _extract_tar_xz(archive: Path, dest_dir: Path, xz_threads: int = 0) -> None:
+    with archive.open("rb") as src:
+        xz = subprocess.Popen(
+            ["xz", f"-T{xz_threads}", "-dc"],
+            stdin=src,
+            stdout=subprocess.PIPE,
+        )
+        tar = subprocess.Popen(
+            ["tar", "-xf", "-", "-C", str(dest_dir)],
+            stdin=xz.stdout,
+        )
+        xz.stdout.close()
+        tar.communicate()
+        xz.wait()
+        if xz.returncode != 0 or tar.returncode != 0:
+            raise RuntimeError(
+                f"xz/tar failed (xz={xz.returncode}, tar={tar.returncode})"
+            )
+
+
 def _process_artifact(
     artifact: str,
     source_run_id: str,
     manifests_dir: Path,
     output_dir: Path,
+    xz_threads: int = 0,
 ) -> None:
     workdir = Path(tempfile.mkdtemp(prefix="repackage-"))
+    # Compress under a temporary name and rename once complete, so a file at
+    # the final path is a valid completion marker for --resume.
+    output_path = output_dir / artifact
+    tmp_path = output_dir / (artifact + ".tmp")
     try:
         dl_dir = workdir / "dl"
         content_dir = workdir / "content"
@@ -213,16 +243,7 @@ def _process_artifact(
 
         print(f"[{artifact}] Extracting...", flush=True)
         content_dir.mkdir()
-        subprocess.run(
-            [
-                "tar",
-                "-xf",
-                str(dl_dir / artifact),
-                "-C",
-                str(content_dir),
-            ],
-            check=True,
-        )
+        _extract_tar_xz(dl_dir / artifact, content_dir, xz_threads)
         shutil.rmtree(dl_dir)
 
         if "debug" in artifact or "asan" in artifact:
@@ -236,11 +257,14 @@ def _process_artifact(
             print(f"[{artifact}] Pruning...", flush=True)
             apply_manifest(manifest, content_dir / "lib")
 
-        output_path = output_dir / artifact
-        file_size = _compress_tar_xz(content_dir, output_path, "-9e", artifact)
+        file_size = _compress_tar_xz(
+            content_dir, tmp_path, "-9e", artifact, xz_threads
+        )
+        tmp_path.replace(output_path)
 
         print(f"[{artifact}] Done ({file_size / 1048576:.1f} MB)", flush=True)
     finally:
+        tmp_path.unlink(missing_ok=True)
         shutil.rmtree(workdir, ignore_errors=True)
 
 
@@ -250,15 +274,37 @@ def repackage(
     output_dir: Path,
     max_parallel: int = 3,
     artifacts: Optional[List[str]] = None,
+    resume: bool = False,
 ) -> None:
     targets = artifacts if artifacts else ARTIFACTS
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if resume:
+        remaining = []
+        for artifact in targets:
+            existing = output_dir / artifact
+            if existing.is_file() and existing.stat().st_size > 0:
+                print(f"[{artifact}] Already repackaged — skipping", flush=True)
+            else:
+                remaining.append(artifact)
+        targets = remaining
+
+    # Split the cores between the workers that will actually run (a resumed
+    # or filtered run may have fewer targets than slots); xz -T0 in every
+    # worker would oversubscribe the machine that many times over.
+    workers = max(1, min(max_parallel, len(targets)))
+    xz_threads = max(1, (os.cpu_count() or 1) // workers)
+
     failed: List[str] = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as pool:
         futures = {
             pool.submit(
-                _process_artifact, a, source_run_id, manifests_dir, output_dir
+                _process_artifact,
+                a,
+                source_run_id,
+                manifests_dir,
+                output_dir,
+                xz_threads,
             ): a
             for a in targets
         }
@@ -298,6 +344,11 @@ def parse_args() -> argparse.Namespace:
     rp.add_argument("--output-dir", type=Path, required=True)
     rp.add_argument("--max-parallel", type=int, default=3)
     rp.add_argument("--artifacts", nargs="*")
+    rp.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip artifacts already present in --output-dir",
+    )
 
     return parser.parse_args()
 
@@ -325,6 +376,7 @@ def main() -> None:
             output_dir=args.output_dir,
             max_parallel=args.max_parallel,
             artifacts=args.artifacts,
+            resume=args.resume,
         )
 
 
@@ -20,12 +20,26 @@ def main():
     project_root = Path(__file__).resolve().parent.parent
     src_dirs = (project_root / "src", project_root / "tests")
 
+    def file_size(file: str) -> int:
+        # A stale database can reference deleted files; let clang-tidy
+        # report those instead of crashing the whole run here.
+        try:
+            return Path(file).stat().st_size
+        except OSError:
+            return 0
+
     cdb = json.loads(cdb_path.read_text())
-    files = [
-        entry["file"]
-        for entry in cdb
-        if any(Path(entry["file"]).resolve().is_relative_to(d) for d in src_dirs)
-    ]
+    # A file can appear once per target in the database; tidy it only once.
+    # Largest files first: a slow file picked up last would run alone at the
+    # end while the rest of the pool sits idle.
+    files = sorted(
+        {
+            entry["file"]
+            for entry in cdb
+            if any(Path(entry["file"]).resolve().is_relative_to(d) for d in src_dirs)
+        },
+        key=lambda f: (-file_size(f), f),
+    )
     total = len(files)
 
     lock = threading.Lock()
@@ -71,41 +71,78 @@ def main() -> int:
         )
         return 1
 
-    # A log can hold several crash sections appended by respawned processes,
-    # each with its own ASLR base — track the most recent one while scanning.
-    base = None
-    for line in text.splitlines():
-        base_match = BASE.search(line)
-        if base_match is not None:
-            base = int(base_match.group(1), 16)
-            print(line)
-            continue
+    def rebase(line: str, base: "int | None") -> "tuple[str, int] | None":
+        """Return (frame number, rebased offset) for an un-symbolized frame
+        of the main module, else None."""
         frame = FRAME.match(line)
         if (
             frame is None
             or base is None
             or os.path.basename(frame.group(2)) != args.module
         ):
-            print(line)
-            continue
+            return None
         offset = int(frame.group(3), 16) - base
-        if offset < 0:
+        return (frame.group(1), offset) if offset >= 0 else None
+
+    # A log can hold several crash sections appended by respawned processes,
+    # each with its own ASLR base — track the most recent one while scanning.
+    # First pass: collect the unique rebased offsets (recursive and repeated
+    # frames share them), keeping first-seen order. None marks "unresolved".
+    lines = text.splitlines()
+    base = None
+    resolved: "dict[int, str | None]" = {}
+    for line in lines:
+        base_match = BASE.search(line)
+        if base_match is not None:
+            base = int(base_match.group(1), 16)
+            continue
+        hit = rebase(line, base)
+        if hit is not None:
+            resolved.setdefault(hit[1], None)
+
+    # llvm-symbolizer answers a batch of stdin addresses with one blank-line-
+    # separated block each, so all frames cost a single process. llvm-gsymutil
+    # has no batch input mode; it still runs once per unique offset.
+    if resolved and tool != args.gsymutil:
+        result = subprocess.run(
+            [tool, f"--obj={args.symbols}", "-f", "-C", "-p"],
+            input="".join(f"{hex(offset)}\n" for offset in resolved),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            for offset, block in zip(resolved, result.stdout.split("\n\n")):
+                entries = [entry for entry in block.splitlines() if entry.strip()]
+                if entries:
+                    resolved[offset] = "\n    ".join(entries)
+    else:
+        for offset in resolved:
+            result = subprocess.run(
+                [tool, "--address", hex(offset), args.symbols],
+                capture_output=True,
+                text=True,
+            )
+            entries = [
+                entry
+                for entry in result.stdout.splitlines()
+                if entry.strip() and "Looking up" not in entry
+            ]
+            if result.returncode == 0 and entries:
+                resolved[offset] = "\n    ".join(entries)
+
+    # Second pass: emit the log with resolvable frames rewritten.
+    base = None
+    for line in lines:
+        base_match = BASE.search(line)
+        if base_match is not None:
+            base = int(base_match.group(1), 16)
             print(line)
             continue
-        if tool == args.gsymutil:
-            command = [tool, "--address", hex(offset), args.symbols]
-        else:
-            command = [tool, f"--obj={args.symbols}", "-f", "-C", "-p", hex(offset)]
-        result = subprocess.run(command, capture_output=True, text=True)
-        lines = [
-            entry
-            for entry in result.stdout.splitlines()
-            if entry.strip() and "Looking up" not in entry
-        ]
-        if result.returncode != 0 or not lines:
+        hit = rebase(line, base)
+        if hit is None or resolved[hit[1]] is None:
             print(line)
             continue
-        print(f"#{frame.group(1)} {hex(offset)} " + "\n    ".join(lines))
+        print(f"#{hit[0]} {hex(hit[1])} " + resolved[hit[1]])
     return 0
 
 